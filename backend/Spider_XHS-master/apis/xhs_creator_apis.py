@@ -1,12 +1,13 @@
-import requests
+from loguru import logger
 from xhs_utils.cookie_util import trans_cookies
 from xhs_utils.xhs_creator_util import get_common_headers, generate_xs, splice_str
-from xhs_utils.xhs_util import generate_x_b3_traceid
+from xhs_utils.xhs_util import generate_x_b3_traceid, create_session
 
 
 class XHS_Creator_Apis():
     def __init__(self):
         self.base_url = "https://edith.xiaohongshu.com"
+        self.session = create_session()
 
 
     # page: 页数
@@ -28,7 +29,7 @@ class XHS_Creator_Apis():
             cookies = trans_cookies(cookies_str)
             xs, xt, _ = generate_xs(cookies['a1'], splice_api, '')
             headers['x-s'], headers['x-t'] = xs, str(xt)
-            response = requests.get(self.base_url + splice_api, headers=headers, cookies=cookies, verify=False)
+            response = self.session.get(self.base_url + splice_api, headers=headers, cookies=cookies, verify=False)
             res_json = response.json()
             success = res_json["success"]
         except Exception as e:
@@ -42,7 +43,7 @@ class XHS_Creator_Apis():
         notes = []
         while True:
             success, msg, res_json = self.get_publish_note_info(page, cookies_str)
-            print(success, msg, res_json)
+            logger.debug('获取发布笔记 page {}: {}, msg: {}, res: {}', page, success, msg, res_json)
             if not success:
                 return False, msg, notes
             notes += res_json['data']['notes']
@@ -27,7 +27,7 @@ class Data_Spider():
         except Exception as e:
             success = False
             msg = e
-        logger.info(f'爬取笔记信息 {note_url}: {success}, msg: {msg}')
+        logger.info('爬取笔记信息 {}: {}, msg: {}', note_url, success, msg)
         return success, msg, note_info
 
     def spider_some_note(self, notes: list, cookies_str: str, base_path: dict, save_choice: str, excel_name: str = '', proxies=None):
@@ -38,17 +38,19 @@ class Data_Spider():
         :param base_path:
         :return:
         """
-        if (save_choice == 'all' or save_choice == 'excel') and excel_name == '':
+        save_excel = save_choice in ('all', 'excel')
+        save_media = save_choice == 'all' or 'media' in save_choice
+        if save_excel and excel_name == '':
             raise ValueError('excel_name 不能为空')
         note_list = []
         for note_url in notes:
             success, msg, note_info = self.spider_note(note_url, cookies_str, proxies)
             if note_info is not None and success:
                 note_list.append(note_info)
-        for note_info in note_list:
-            if save_choice == 'all' or 'media' in save_choice:
+        if save_media:
+            for note_info in note_list:
                 download_note(note_info, base_path['media'], save_choice)
-        if save_choice == 'all' or save_choice == 'excel':
+        if save_excel:
             file_path = os.path.abspath(os.path.join(base_path['excel'], f'{excel_name}.xlsx'))
             save_to_xlsx(note_list, file_path)
 
@@ -65,17 +67,15 @@ class Data_Spider():
         try:
             success, msg, all_note_info = self.xhs_apis.get_user_all_notes(user_url, cookies_str, proxies)
             if success:
-                logger.info(f'用户 {user_url} 作品数量: {len(all_note_info)}')
-                for simple_note_info in all_note_info:
-                    note_url = f"https://www.xiaohongshu.com/explore/{simple_note_info['note_id']}?xsec_token={simple_note_info['xsec_token']}"
-                    note_list.append(note_url)
+                logger.info('用户 {} 作品数量: {}', user_url, len(all_note_info))
+                note_list = [f"https://www.xiaohongshu.com/explore/{simple_note_info['note_id']}?xsec_token={simple_note_info['xsec_token']}" for simple_note_info in all_note_info]
             if save_choice == 'all' or save_choice == 'excel':
                 excel_name = user_url.split('/')[-1].split('?')[0]
             self.spider_some_note(note_list, cookies_str, base_path, save_choice, excel_name, proxies)
         except Exception as e:
             success = False
             msg = e
-        logger.info(f'爬取用户所有视频 {user_url}: {success}, msg: {msg}')
+        logger.info('爬取用户所有视频 {}: {}, msg: {}', user_url, success, msg)
         return note_list, success, msg
 
     def spider_some_search_note(self, query: str, require_num: int, cookies_str: str, base_path: dict, save_choice: str, sort_type_choice=0, note_type=0, note_time=0, note_range=0, pos_distance=0, geo: dict = None,  excel_name: str = '', proxies=None):
@@ -96,18 +96,16 @@ class Data_Spider():
         try:
             success, msg, notes = self.xhs_apis.search_some_note(query, require_num, cookies_str, sort_type_choice, note_type, note_time, note_range, pos_distance, geo, proxies)
             if success:
-                notes = list(filter(lambda x: x['model_type'] == "note", notes))
-                logger.info(f'搜索关键词 {query} 笔记数量: {len(notes)}')
-                for note in notes:
-                    note_url = f"https://www.xiaohongshu.com/explore/{note['id']}?xsec_token={note['xsec_token']}"
-                    note_list.append(note_url)
+                notes = [note for note in notes if note['model_type'] == "note"]
+                logger.info('搜索关键词 {} 笔记数量: {}', query, len(notes))
+                note_list = [f"https://www.xiaohongshu.com/explore/{note['id']}?xsec_token={note['xsec_token']}" for note in notes]
             if save_choice == 'all' or save_choice == 'excel':
                 excel_name = query
             self.spider_some_note(note_list, cookies_str, base_path, save_choice, excel_name, proxies)
         except Exception as e:
             success = False
             msg = e
-        logger.info(f'搜索关键词 {query} 笔记: {success}, msg: {msg}')
+        logger.info('搜索关键词 {} 笔记: {}, msg: {}', query, success, msg)
         return note_list, success, msg
 
 if __name__ == '__main__':
@@ -1,6 +1,12 @@
+from functools import lru_cache
+
+
+# 同一份cookies会在翻页和批量爬取时反复解析 这里缓存解析结果 调用方不要修改返回的字典
+@lru_cache(maxsize=32)
 def trans_cookies(cookies_str):
-    if '; ' in cookies_str:
-        ck = {i.split('=')[0]: '='.join(i.split('=')[1:]) for i in cookies_str.split('; ')}
-    else:
-        ck = {i.split('=')[0]: '='.join(i.split('=')[1:]) for i in cookies_str.split(';')}
+    sep = '; ' if '; ' in cookies_str else ';'
+    ck = {}
+    for i in cookies_str.split(sep):
+        key, _, value = i.partition('=')
+        ck[key] = value
     return ck
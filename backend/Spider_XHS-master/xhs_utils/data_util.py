@@ -1,19 +1,38 @@
 import json
 import os
 import re
+import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 import openpyxl
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
 from retry import retry
+from urllib3.util.retry import Retry
+
+ILLEGAL_STR_RE = re.compile(r"[\\/:*?\"<>| \r\n]+")
+ILLEGAL_CHARACTERS_RE = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+# 单篇笔记内媒体文件的并发下载数
+MEDIA_DOWNLOAD_WORKERS = 8
+
+# 媒体下载共用一个session 复用到cdn的tcp/tls连接 连接池大小与并发数一致
+media_session = requests.Session()
+media_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=MEDIA_DOWNLOAD_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504]),
+)
+media_session.mount('https://', media_adapter)
+media_session.mount('http://', media_adapter)
 
 
 def norm_str(str):
-    new_str = re.sub(r"|[\\/:*?\"<>| ]+", "", str).replace('\n', '').replace('\r', '')
+    new_str = ILLEGAL_STR_RE.sub("", str)
     return new_str
 
 def norm_text(text):
-    ILLEGAL_CHARACTERS_RE = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
     text = ILLEGAL_CHARACTERS_RE.sub(r'', text)
     return text
 
@@ -24,22 +43,24 @@ def timestamp_to_str(timestamp):
     return dt
 
 def handle_user_info(data, user_id):
+    basic_info = data['basic_info']
+    interactions = data['interactions']
     home_url = f'https://www.xiaohongshu.com/user/profile/{user_id}'
-    nickname = data['basic_info']['nickname']
-    avatar = data['basic_info']['imageb']
-    red_id = data['basic_info']['red_id']
-    gender = data['basic_info']['gender']
+    nickname = basic_info['nickname']
+    avatar = basic_info['imageb']
+    red_id = basic_info['red_id']
+    gender = basic_info['gender']
     if gender == 0:
         gender = '男'
     elif gender == 1:
         gender = '女'
     else:
         gender = '未知'
-    ip_location = data['basic_info']['ip_location']
-    desc = data['basic_info']['desc']
-    follows = data['interactions'][0]['count']
-    fans = data['interactions'][1]['count']
-    interaction = data['interactions'][2]['count']
+    ip_location = basic_info['ip_location']
+    desc = basic_info['desc']
+    follows = interactions[0]['count']
+    fans = interactions[1]['count']
+    interaction = interactions[2]['count']
     tags_temp = data['tags']
     tags = []
     for tag in tags_temp:
@@ -65,24 +86,27 @@ def handle_user_info(data, user_id):
 def handle_note_info(data):
     note_id = data['id']
     note_url = data['url']
-    note_type = data['note_card']['type']
+    note_card = data['note_card']
+    note_type = note_card['type']
     if note_type == 'normal':
         note_type = '图集'
     else:
         note_type = '视频'
-    user_id = data['note_card']['user']['user_id']
+    user = note_card['user']
+    interact_info = note_card['interact_info']
+    user_id = user['user_id']
     home_url = f'https://www.xiaohongshu.com/user/profile/{user_id}'
-    nickname = data['note_card']['user']['nickname']
-    avatar = data['note_card']['user']['avatar']
-    title = data['note_card']['title']
+    nickname = user['nickname']
+    avatar = user['avatar']
+    title = note_card['title']
     if title.strip() == '':
         title = f'无标题'
-    desc = data['note_card']['desc']
-    liked_count = data['note_card']['interact_info']['liked_count']
-    collected_count = data['note_card']['interact_info']['collected_count']
-    comment_count = data['note_card']['interact_info']['comment_count']
-    share_count = data['note_card']['interact_info']['share_count']
-    image_list_temp = data['note_card']['image_list']
+    desc = note_card['desc']
+    liked_count = interact_info['liked_count']
+    collected_count = interact_info['collected_count']
+    comment_count = interact_info['comment_count']
+    share_count = interact_info['share_count']
+    image_list_temp = note_card['image_list']
     image_list = []
     for image in image_list_temp:
         try:
@@ -93,21 +117,21 @@ def handle_note_info(data):
             pass
     if note_type == '视频':
         video_cover = image_list[0]
-        video_addr = 'https://sns-video-bd.xhscdn.com/' + data['note_card']['video']['consumer']['origin_video_key']
+        video_addr = 'https://sns-video-bd.xhscdn.com/' + note_card['video']['consumer']['origin_video_key']
         # success, msg, video_addr = XHS_Apis.get_note_no_water_video(note_id)
     else:
         video_cover = None
         video_addr = None
-    tags_temp = data['note_card']['tag_list']
+    tags_temp = note_card['tag_list']
     tags = []
     for tag in tags_temp:
         try:
             tags.append(tag['name'])
         except:
             pass
-    upload_time = timestamp_to_str(data['note_card']['time'])
-    if 'ip_location' in data['note_card']:
-        ip_location = data['note_card']['ip_location']
+    upload_time = timestamp_to_str(note_card['time'])
+    if 'ip_location' in note_card:
+        ip_location = note_card['ip_location']
     else:
         ip_location = '未知'
     return {
@@ -176,8 +200,9 @@ def handle_comment_info(data):
         'pictures': pictures,
     }
 def save_to_xlsx(datas, file_path, type='note'):
-    wb = openpyxl.Workbook()
-    ws = wb.active
+    # write_only 模式逐行写出 不在内存中保留所有单元格对象
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
     if type == 'note':
         headers = ['笔记id', '笔记url', '笔记类型', '用户id', '用户主页url', '昵称', '头像url', '标题', '描述', '点赞数量', '收藏数量', '评论数量', '分享数量', '视频封面url', '视频地址url', '图片地址url列表', '标签', '上传时间', 'ip归属地']
     elif type == 'user':
@@ -186,24 +211,29 @@ def save_to_xlsx(datas, file_path, type='note'):
         headers = ['笔记id', '笔记url', '评论id', '用户id', '用户主页url', '昵称', '头像url', '评论内容', '评论标签', '点赞数量', '上传时间', 'ip归属地', '图片地址url列表']
     ws.append(headers)
     for data in datas:
-        data = {k: norm_text(str(v)) for k, v in data.items()}
-        ws.append(list(data.values()))
+        ws.append([norm_text(str(v)) for v in data.values()])
     wb.save(file_path)
-    logger.info(f'数据保存至 {file_path}')
+    logger.info('数据保存至 {}', file_path)
 
 def download_media(path, name, url, type):
     if type == 'image':
-        content = requests.get(url).content
-        with open(path + '/' + name + '.jpg', mode="wb") as f:
-            f.write(content)
+        file_path = path + '/' + name + '.jpg'
     elif type == 'video':
-        res = requests.get(url, stream=True)
-        size = 0
-        chunk_size = 1024 * 1024
-        with open(path + '/' + name + '.mp4', mode="wb") as f:
-            for data in res.iter_content(chunk_size=chunk_size):
-                f.write(data)
-                size += len(data)
+        file_path = path + '/' + name + '.mp4'
+    else:
+        return
+    # 流式写入文件 不把整个文件读进内存
+    with media_session.get(url, stream=True) as res:
+        res.raw.decode_content = True
+        with open(file_path, mode="wb") as f:
+            shutil.copyfileobj(res.raw, f, 1024 * 1024)
+
+def download_medias(path, medias):
+    # medias: [(name, url, type), ...] 并发下载 任意一个失败都会抛出异常 交给download_note的retry处理
+    with ThreadPoolExecutor(max_workers=MEDIA_DOWNLOAD_WORKERS) as executor:
+        futures = [executor.submit(download_media, path, name, url, type) for name, url, type in medias]
+    for future in futures:
+        future.result()
 
 def save_user_detail(user, path):
     with open(f'{path}/detail.txt', mode="w", encoding="utf-8") as f:
@@ -263,11 +293,11 @@ def download_note(note_info, path, save_choice):
     note_type = note_info['note_type']
     save_note_detail(note_info, save_path)
     if note_type == '图集' and save_choice in ['media', 'media-image', 'all']:
-        for img_index, img_url in enumerate(note_info['image_list']):
-            download_media(save_path, f'image_{img_index}', img_url, 'image')
+        medias = [(f'image_{img_index}', img_url, 'image') for img_index, img_url in enumerate(note_info['image_list'])]
+        download_medias(save_path, medias)
     elif note_type == '视频' and save_choice in ['media', 'media-video', 'all']:
-        download_media(save_path, 'cover', note_info['video_cover'], 'image')
-        download_media(save_path, 'video', note_info['video_addr'], 'video')
+        medias = [('cover', note_info['video_cover'], 'image'), ('video', note_info['video_addr'], 'video')]
+        download_medias(save_path, medias)
     return save_path
 
 
@@ -16,33 +16,33 @@ def generate_xs(a1, api, data=''):
     return xs, xt, data
 
 
+COMMON_HEADERS = {
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0",
+    "accept": "application/json, text/plain, */*",
+    "Host": "edith.xiaohongshu.com",
+    "pragma": "no-cache",
+    "cache-control": "no-cache",
+    "sec-ch-ua-platform": "\"Windows\"",
+    "authorization": "",
+    "sec-ch-ua": "\"Not)A;Brand\";v=\"8\", \"Chromium\";v=\"138\", \"Microsoft Edge\";v=\"138\"",
+    "sec-ch-ua-mobile": "?0",
+    "x-t": "",
+    "x-s": "",
+    "origin": "https://creator.xiaohongshu.com",
+    "sec-fetch-site": "same-site",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-dest": "empty",
+    "referer": "https://creator.xiaohongshu.com/",
+    "accept-language": "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
+    "priority": "u=1, i"
+}
+
+
 def get_common_headers():
-    return {
-        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0",
-        "accept": "application/json, text/plain, */*",
-        "Host": "edith.xiaohongshu.com",
-        "pragma": "no-cache",
-        "cache-control": "no-cache",
-        "sec-ch-ua-platform": "\"Windows\"",
-        "authorization": "",
-        "sec-ch-ua": "\"Not)A;Brand\";v=\"8\", \"Chromium\";v=\"138\", \"Microsoft Edge\";v=\"138\"",
-        "sec-ch-ua-mobile": "?0",
-        "x-t": "",
-        "x-s": "",
-        "origin": "https://creator.xiaohongshu.com",
-        "sec-fetch-site": "same-site",
-        "sec-fetch-mode": "cors",
-        "sec-fetch-dest": "empty",
-        "referer": "https://creator.xiaohongshu.com/",
-        "accept-language": "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
-        "priority": "u=1, i"
-    }
+    return dict(COMMON_HEADERS)
 
 
 def splice_str(api, params):
-    url = api + '?'
-    for key, value in params.items():
-        if value is None:
-            value = ''
-        url += key + '=' + value + '&'
-    return url[:-1]
\ No newline at end of file
+    if not params:
+        return api
+    return api + '?' + '&'.join(key + '=' + ('' if value is None else value) for key, value in params.items())
\ No newline at end of file